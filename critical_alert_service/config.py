@@ -1,16 +1,18 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+import functools
 import os
 import re
 import sys
 from typing import List, Optional
-from urllib.parse import urlparse
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Config:
     port: int
+    http_threads: int
+    http_max_connections: int
     max_body_bytes: int
     request_id_header: str
     auth_mode: str
@@ -45,6 +47,10 @@ def _get_env(name: str, default: Optional[str] = None) -> Optional[str]:
     return value
 
 
+def _env_str(name: str, default: str) -> str:
+    return os.getenv(name) or default
+
+
 def _parse_int(name: str, default: int, minimum: int, maximum: int, required: bool = False) -> int:
     raw = _get_env(name)
     if raw is None:
@@ -91,8 +97,8 @@ def _validate_secret(name: str, value: str, min_len: int, max_len: int) -> None:
 def _validate_url(name: str, value: str) -> None:
     if value.strip() != value:
         _fail(f"{name} must not contain leading/trailing whitespace")
-    parsed = urlparse(value)
-    if parsed.scheme not in {"http", "https"} or not parsed.netloc:
+    scheme, _, rest = value.partition("://")
+    if scheme.lower() not in ("http", "https") or not rest or rest[0] in "/?#":
         _fail(f"{name} must be an absolute http/https URL")
 
 
@@ -109,13 +115,16 @@ def _validate_emails(name: str, emails: List[str]) -> None:
             _fail(f"{name} must contain valid email addresses")
 
 
+@functools.lru_cache(maxsize=1)
 def load_config() -> Config:
     port = _parse_int("PORT", 8080, 1, 65535)
+    http_threads = _parse_int("CAS_HTTP_THREADS", min(32, (os.cpu_count() or 1) * 4), 1, 1024)
+    http_max_connections = _parse_int("CAS_HTTP_MAX_CONNECTIONS", 512, 1, 65536)
     max_body_bytes = _parse_int("CAS_MAX_BODY_BYTES", 16384, 1024, 1048576)
-    request_id_header = _get_env("CAS_REQUEST_ID_HEADER", "X-Request-Id") or "X-Request-Id"
+    request_id_header = _env_str("CAS_REQUEST_ID_HEADER", "X-Request-Id")
     _validate_header_name("CAS_REQUEST_ID_HEADER", request_id_header)
 
-    auth_mode = (_get_env("CAS_AUTH_MODE") or "").strip()
+    auth_mode = _env_str("CAS_AUTH_MODE", "").strip()
     if not auth_mode:
         _fail("CAS_AUTH_MODE is required")
     if auth_mode not in {"token", "secret", "either", "both"}:
@@ -125,7 +134,7 @@ def load_config() -> Config:
     if auth_tokens:
         _validate_token_list(auth_tokens, "CAS_AUTH_BEARER_TOKENS", 10, 200)
 
-    auth_secret_header_name = _get_env("CAS_AUTH_SECRET_HEADER_NAME", "X-Alert-Secret") or "X-Alert-Secret"
+    auth_secret_header_name = _env_str("CAS_AUTH_SECRET_HEADER_NAME", "X-Alert-Secret")
     _validate_header_name("CAS_AUTH_SECRET_HEADER_NAME", auth_secret_header_name)
 
     auth_shared_secret = _get_env("CAS_AUTH_SHARED_SECRET")
@@ -144,12 +153,12 @@ def load_config() -> Config:
         _fail("CAS_MAILMUX_BASE_URL is required")
     _validate_url("CAS_MAILMUX_BASE_URL", mailmux_base_url)
 
-    mailmux_send_path = _get_env("CAS_MAILMUX_SEND_PATH", "/v1/send") or "/v1/send"
+    mailmux_send_path = _env_str("CAS_MAILMUX_SEND_PATH", "/v1/send")
     _validate_path("CAS_MAILMUX_SEND_PATH", mailmux_send_path)
 
     mailmux_timeout_ms = _parse_int("CAS_MAILMUX_TIMEOUT_MS", 5000, 100, 60000)
 
-    mailmux_auth_mode = (_get_env("CAS_MAILMUX_AUTH_MODE", "none") or "none").strip()
+    mailmux_auth_mode = _env_str("CAS_MAILMUX_AUTH_MODE", "none").strip()
     if mailmux_auth_mode not in {"none", "token", "header"}:
         _fail("CAS_MAILMUX_AUTH_MODE must be one of none|token|header")
 
@@ -171,16 +180,18 @@ def load_config() -> Config:
     mailmux_to = _parse_list("CAS_MAILMUX_TO", required=True)
     _validate_emails("CAS_MAILMUX_TO", mailmux_to)
 
-    mailmux_from = _get_env("CAS_MAILMUX_FROM", "critical-alert-service@localhost") or "critical-alert-service@localhost"
+    mailmux_from = _env_str("CAS_MAILMUX_FROM", "critical-alert-service@localhost")
     if not mailmux_from.strip():
         _fail("CAS_MAILMUX_FROM must be non-empty")
 
-    mailmux_subject_prefix = _get_env("CAS_MAILMUX_SUBJECT_PREFIX", "[CRITICAL]") or "[CRITICAL]"
+    mailmux_subject_prefix = _env_str("CAS_MAILMUX_SUBJECT_PREFIX", "[CRITICAL]")
     if not mailmux_subject_prefix.strip():
         _fail("CAS_MAILMUX_SUBJECT_PREFIX must be non-empty")
 
     return Config(
         port=port,
+        http_threads=http_threads,
+        http_max_connections=http_max_connections,
         max_body_bytes=max_body_bytes,
         request_id_header=request_id_header,
         auth_mode=auth_mode,
@@ -1,70 +1,82 @@
 from __future__ import annotations
 
 from typing import Any, Dict, Tuple
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 
 from .config import Config
 
+_POOL_CONNECTIONS = 4
 
-def build_subject(config: Config, alert: Dict[str, Any]) -> str:
-    return (
-        f"{config.mailmux_subject_prefix} {alert['service']} "
-        f"({alert['environment']}) {alert['error_code']}: {alert['summary']}"
-    )
+
+def subject_template(prefix: str) -> str:
+    escaped = prefix.replace("{", "{{").replace("}", "}}")
+    return f"{escaped} {{service}} ({{environment}}) {{error_code}}: {{summary}}"
 
 
 def build_text(alert: Dict[str, Any], request_id: str) -> str:
-    lines = [
-        "Severity: CRITICAL",
-        f"Service: {alert['service']}",
-        f"Environment: {alert['environment']}",
-        f"Error Code: {alert['error_code']}",
-        f"Summary: {alert['summary']}",
-        f"Details: {alert['details']}",
-        f"Resource: {alert['resource']}",
-        f"Occurred At: {alert['occurred_at']}",
-    ]
+    text = (
+        "Severity: CRITICAL\n"
+        f"Service: {alert['service']}\n"
+        f"Environment: {alert['environment']}\n"
+        f"Error Code: {alert['error_code']}\n"
+        f"Summary: {alert['summary']}\n"
+        f"Details: {alert['details']}\n"
+        f"Resource: {alert['resource']}\n"
+        f"Occurred At: {alert['occurred_at']}\n"
+    )
 
     runbook = alert.get("runbook_url")
     if runbook:
-        lines.append(f"Runbook URL: {runbook}")
+        text += f"Runbook URL: {runbook}\n"
 
-    tags = alert.get("tags") or {}
+    tags = alert.get("tags")
     if tags:
-        lines.append("Tags:")
-        for key in sorted(tags.keys()):
-            lines.append(f"{key}={tags[key]}")
-
-    lines.append(f"Request ID: {request_id}")
-    return "\n".join(lines)
-
-
-def build_payload(config: Config, alert: Dict[str, Any], request_id: str) -> Dict[str, Any]:
-    subject = build_subject(config, alert)
-    text = build_text(alert, request_id)
-    return {
-        "to": config.mailmux_to,
-        "from": config.mailmux_from,
-        "subject": subject,
-        "text": text,
-    }
-
-
-def send_mailmux(config: Config, alert: Dict[str, Any], request_id: str) -> Tuple[int, Dict[str, Any]]:
-    url = f"{config.mailmux_base_url}{config.mailmux_send_path}"
-    headers = {
-        "Content-Type": "application/json",
-        "User-Agent": "critical-alert-service/1",
-        "X-Request-Id": request_id,
-    }
-
-    if config.mailmux_auth_mode == "token":
-        headers["Authorization"] = f"Bearer {config.mailmux_bearer_token}"
-    elif config.mailmux_auth_mode == "header":
-        headers[config.mailmux_auth_header_name or ""] = config.mailmux_auth_header_value or ""
-
-    payload = build_payload(config, alert, request_id)
-    timeout_sec = config.mailmux_timeout_ms / 1000.0
-
-    response = requests.post(url, json=payload, headers=headers, timeout=timeout_sec)
-    return response.status_code, payload
+        text += "Tags:\n" + "".join(f"{key}={tags[key]}\n" for key in sorted(tags))
+
+    return f"{text}Request ID: {request_id}"
+
+
+class MailmuxClient:
+    def __init__(self, config: Config) -> None:
+        self.url = f"{config.mailmux_base_url}{config.mailmux_send_path}"
+        self.timeout = config.mailmux_timeout_ms / 1000.0
+        self.base_headers = {
+            "Content-Type": "application/json",
+            "User-Agent": "critical-alert-service/1",
+        }
+
+        auth_header_name = config.mailmux_auth_header_name
+        if config.mailmux_auth_mode == "token" and config.mailmux_bearer_token:
+            self.base_headers["Authorization"] = f"Bearer {config.mailmux_bearer_token}"
+        elif config.mailmux_auth_mode == "header" and auth_header_name and config.mailmux_auth_header_value:
+            self.base_headers[auth_header_name] = config.mailmux_auth_header_value
+
+        self._to = config.mailmux_to
+        self._from = config.mailmux_from
+        self._format_subject = subject_template(config.mailmux_subject_prefix).format_map
+
+        self.session = requests.Session()
+        # One pooled connection per handler thread; retries stay off because
+        # delivery is attempted exactly once.
+        adapter = HTTPAdapter(pool_connections=_POOL_CONNECTIONS, pool_maxsize=config.http_threads, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def build_payload(self, alert: Dict[str, Any], request_id: str) -> Dict[str, Any]:
+        return {
+            "to": self._to,
+            "from": self._from,
+            "subject": self._format_subject(alert),
+            "text": build_text(alert, request_id),
+        }
+
+    def send(self, alert: Dict[str, Any], request_id: str) -> Tuple[int, Dict[str, Any]]:
+        headers = self.base_headers.copy()
+        headers["X-Request-Id"] = request_id
+
+        payload = self.build_payload(alert, request_id)
+        body = orjson.dumps(payload)
+        response = self.session.post(self.url, data=body, headers=headers, timeout=self.timeout)
+        return response.status_code, payload
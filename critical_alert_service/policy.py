@@ -2,37 +2,46 @@ from __future__ import annotations
 
 from collections import OrderedDict
 from dataclasses import dataclass
+import functools
 import hashlib
+import math
+import re
 import threading
 import time
-from typing import Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
-
-def _normalize_text(value: str) -> str:
-    return " ".join(value.strip().split())
+_WS_RE = re.compile(r"\s+")
+_MAX_STRIPES = 16
+_MIN_KEYS_PER_STRIPE = 1024
+_NS_PER_SECOND = 1_000_000_000
 
 
+@functools.lru_cache(maxsize=4096)
 def _normalize_key_part(value: str) -> str:
     return value.strip().lower()
 
 
+def policy_keys(alert: Dict[str, str]) -> Tuple[str, str]:
+    # Returns (dedupe_key, rate_limit_key). service, environment and error_code
+    # repeat across alerts and go through the cached helper; resource and
+    # summary are free text, so they are normalized inline. The parts are fed
+    # to the hasher one by one rather than joined first.
+    service = _normalize_key_part(alert["service"])
+    error_code = _normalize_key_part(alert["error_code"])
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (service, _normalize_key_part(alert["environment"]), error_code, alert["resource"].strip().lower()):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"|")
+    digest.update(_WS_RE.sub(" ", alert["summary"].strip()).encode("utf-8"))
+    return digest.hexdigest(), f"{service}|{error_code}"
+
+
 def dedupe_key(alert: Dict[str, str]) -> str:
-    parts = [
-        _normalize_key_part(alert["service"]),
-        _normalize_key_part(alert["environment"]),
-        _normalize_key_part(alert["error_code"]),
-        _normalize_key_part(alert["resource"]),
-        _normalize_text(alert["summary"]),
-    ]
-    combined = "|".join(parts)
-    return hashlib.sha256(combined.encode("utf-8")).hexdigest()
+    return policy_keys(alert)[0]
 
 
 def rate_limit_key(alert: Dict[str, str]) -> str:
-    return "|".join([
-        _normalize_key_part(alert["service"]),
-        _normalize_key_part(alert["error_code"]),
-    ])
+    return policy_keys(alert)[1]
 
 
 @dataclass
@@ -42,27 +51,47 @@ class DedupeResult:
     retry_after: Optional[int]
 
 
-class DedupeStore:
+class _StripedStore:
+    # Each stripe is kept oldest-first (by expiry for dedupe, by last touch
+    # for the rate limiter). Stale entries are dropped lazily when their key
+    # is read, and at capacity the front entry is evicted in O(1), which is
+    # always the first to go stale.
+    # Small stores keep a single stripe so max_keys is an exact bound. Larger
+    # ones use up to _MAX_STRIPES (a power of two) with the per-stripe cap
+    # rounded up, so total capacity is at least max_keys; each stripe evicts
+    # on its own, though, so an uneven key spread can evict before the store
+    # as a whole is full.
+    def __init__(self, max_keys: int):
+        stripes = 1
+        while stripes < _MAX_STRIPES and stripes * 2 * _MIN_KEYS_PER_STRIPE <= max_keys:
+            stripes *= 2
+        self._stripe_mask = stripes - 1
+        self._stripe_max_keys = max(1, -(-max_keys // stripes))
+        self._locks = [threading.Lock() for _ in range(stripes)]
+        self._stripes: List["OrderedDict[str, Any]"] = [OrderedDict() for _ in range(stripes)]
+
+
+class DedupeStore(_StripedStore):
     def __init__(self, window_seconds: int, max_keys: int):
+        super().__init__(max_keys)
         self._window = window_seconds
-        self._max_keys = max_keys
-        self._lock = threading.Lock()
-        self._store: "OrderedDict[str, float]" = OrderedDict()
+        self._window_ns = window_seconds * _NS_PER_SECOND
 
     def check(self, key: str) -> DedupeResult:
         if self._window == 0:
             return DedupeResult(False, key, None)
-        now = time.time()
-        with self._lock:
-            ts = self._store.get(key)
-            if ts is not None and (now - ts) < self._window:
-                remaining = int(self._window - (now - ts))
-                self._store.move_to_end(key)
-                return DedupeResult(True, key, max(0, remaining))
-            self._store[key] = now
-            self._store.move_to_end(key)
-            while len(self._store) > self._max_keys:
-                self._store.popitem(last=False)
+        now = time.monotonic_ns()
+        index = hash(key) & self._stripe_mask
+        stripe = self._stripes[index]
+        with self._locks[index]:
+            expires_at = stripe.get(key)
+            if expires_at is not None:
+                if expires_at > now:
+                    return DedupeResult(True, key, (expires_at - now) // _NS_PER_SECOND)
+                del stripe[key]
+            stripe[key] = now + self._window_ns
+            if len(stripe) > self._stripe_max_keys:
+                stripe.popitem(last=False)
         return DedupeResult(False, key, None)
 
 
@@ -74,37 +103,33 @@ class RateLimitResult:
     reset_at: Optional[int]
 
 
-class RateLimiter:
+class RateLimiter(_StripedStore):
     def __init__(self, max_per_window: int, window_seconds: int, max_keys: int):
+        super().__init__(max_keys)
         self._max = max_per_window
-        self._window = window_seconds
-        self._max_keys = max_keys
-        self._lock = threading.Lock()
-        self._store: "OrderedDict[str, Tuple[float, int]]" = OrderedDict()
+        self._refill_per_second = max_per_window / window_seconds
+        self._refill_per_ns = self._refill_per_second / _NS_PER_SECOND
 
     def check(self, key: str) -> RateLimitResult:
         if self._max == 0:
             return RateLimitResult(False, key, None, None)
-        now = time.time()
-        with self._lock:
-            entry = self._store.get(key)
+        now = time.monotonic_ns()
+        index = hash(key) & self._stripe_mask
+        stripe = self._stripes[index]
+        with self._locks[index]:
+            # entry is a mutable [tokens, last_refill_ns] pair updated in place.
+            entry = stripe.get(key)
             if entry is None:
-                self._store[key] = (now, 1)
-            else:
-                window_start, count = entry
-                if (now - window_start) >= self._window:
-                    window_start = now
-                    count = 1
-                    self._store[key] = (window_start, count)
-                else:
-                    if count >= self._max:
-                        reset_at = int(window_start + self._window)
-                        retry_after = int(max(0, window_start + self._window - now))
-                        self._store.move_to_end(key)
-                        return RateLimitResult(True, key, retry_after, reset_at)
-                    count += 1
-                    self._store[key] = (window_start, count)
-            self._store.move_to_end(key)
-            while len(self._store) > self._max_keys:
-                self._store.popitem(last=False)
-        return RateLimitResult(False, key, None, None)
+                stripe[key] = [self._max - 1.0, now]
+                if len(stripe) > self._stripe_max_keys:
+                    stripe.popitem(last=False)
+                return RateLimitResult(False, key, None, None)
+            stripe.move_to_end(key)
+            tokens = min(self._max, entry[0] + (now - entry[1]) * self._refill_per_ns)
+            entry[1] = now
+            if tokens >= 1.0:
+                entry[0] = tokens - 1.0
+                return RateLimitResult(False, key, None, None)
+            entry[0] = tokens
+        retry_after = math.ceil((1.0 - tokens) / self._refill_per_second)
+        return RateLimitResult(True, key, retry_after, int(time.time()) + retry_after)
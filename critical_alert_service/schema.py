@@ -1,8 +1,11 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Tuple
+from typing import Annotated, Any, Dict, FrozenSet, Literal, Tuple, Union
 import re
+import string
 import jsonschema
+import msgspec
+import orjson
 
 INCOMING_ALERT_SCHEMA: Dict[str, Any] = {
     "$schema": "https://json-schema.org/draft/2020-12/schema",
@@ -25,34 +28,28 @@ INCOMING_ALERT_SCHEMA: Dict[str, Any] = {
             "type": "string",
             "minLength": 1,
             "maxLength": 80,
-            "pattern": "^[a-zA-Z0-9][a-zA-Z0-9._-]{0,79}$",
         },
         "environment": {
             "type": "string",
             "minLength": 1,
             "maxLength": 40,
-            "pattern": "^[a-zA-Z0-9][a-zA-Z0-9._-]{0,39}$",
         },
         "error_code": {
             "type": "string",
             "minLength": 1,
             "maxLength": 80,
-            "pattern": "^[A-Z0-9][A-Z0-9_\-]{0,79}$",
         },
         "summary": {"type": "string", "minLength": 1, "maxLength": 200},
         "details": {"type": "string", "minLength": 0, "maxLength": 4000},
         "resource": {"type": "string", "minLength": 1, "maxLength": 200},
-        "occurred_at": {"type": "string", "format": "date-time"},
-        "runbook_url": {"type": "string", "format": "uri", "pattern": "^https?://"},
+        "occurred_at": {"type": "string"},
+        "runbook_url": {"type": "string"},
         "tags": {
             "type": "object",
-            "additionalProperties": False,
             "maxProperties": 20,
-            "patternProperties": {
-                "^[a-zA-Z0-9][a-zA-Z0-9._-]{0,39}$": {
-                    "type": "string",
-                    "maxLength": 200,
-                }
+            "additionalProperties": {
+                "type": "string",
+                "maxLength": 200,
             },
         },
     },
@@ -84,23 +81,109 @@ OUTBOUND_MAILMUX_SCHEMA: Dict[str, Any] = {
 }
 
 
+_ALNUM = string.ascii_letters + string.digits
+_UPPER_ALNUM = string.ascii_uppercase + string.digits
+
+_Charset = Tuple[str, FrozenSet[str], Dict[int, None]]
+
+
+def _charset(pattern: str, first_chars: str, allowed_chars: str) -> _Charset:
+    return pattern, frozenset(first_chars), dict.fromkeys(map(ord, allowed_chars))
+
+
+# The CONFIG_SPEC patterns for these fields are checked outside the schema:
+# str.translate deletes every allowed character, so a valid value leaves "".
+_CHARSET_VALIDATORS: Dict[str, _Charset] = {
+    "service": _charset("^[a-zA-Z0-9][a-zA-Z0-9._-]{0,79}$", _ALNUM, _ALNUM + "._-"),
+    "environment": _charset("^[a-zA-Z0-9][a-zA-Z0-9._-]{0,39}$", _ALNUM, _ALNUM + "._-"),
+    "error_code": _charset("^[A-Z0-9][A-Z0-9_\\-]{0,79}$", _UPPER_ALNUM, _UPPER_ALNUM + "_-"),
+}
+_TAG_KEY_CHARSET = _charset("^[a-zA-Z0-9][a-zA-Z0-9._-]{0,39}$", _ALNUM, _ALNUM + "._-")
+_TAG_KEY_MAX_LENGTH = 40
+_RUNBOOK_URL_PREFIXES = ("http://", "https://")
+_RFC3339 = re.compile(
+    r"^[0-9]{4}-[0-9]{2}-[0-9]{2}T[0-9]{2}:[0-9]{2}:[0-9]{2}(?:\.[0-9]+)?(?:Z|[+-][0-9]{2}:[0-9]{2})\Z"
+)
+
+
+def _charset_ok(value: str, charset: _Charset) -> bool:
+    _, first_chars, table = charset
+    return value[:1] in first_chars and value.translate(table) == ""
+
+
+jsonschema.Draft202012Validator.check_schema(INCOMING_ALERT_SCHEMA)
+jsonschema.Draft202012Validator.check_schema(OUTBOUND_MAILMUX_SCHEMA)
+
+_INCOMING_VALIDATOR = jsonschema.Draft202012Validator(INCOMING_ALERT_SCHEMA)
+
+
+# Mirrors INCOMING_ALERT_SCHEMA plus the out-of-schema checks below, so that a
+# body msgspec accepts is one validate_alert would accept too; the differential
+# test in tests/test_schema.py keeps the two in step. The identifier charsets
+# and the runbook_url scheme use the same regex-free checks as _check_fields,
+# run from __post_init__ (a ValueError there surfaces as a ValidationError).
+_TagKey = Annotated[str, msgspec.Meta(max_length=_TAG_KEY_MAX_LENGTH)]
+_TagValue = Annotated[str, msgspec.Meta(max_length=200)]
+
+
+class Alert(msgspec.Struct, forbid_unknown_fields=True):
+    severity: Literal["CRITICAL"]
+    service: Annotated[str, msgspec.Meta(max_length=80)]
+    environment: Annotated[str, msgspec.Meta(max_length=40)]
+    error_code: Annotated[str, msgspec.Meta(max_length=80)]
+    summary: Annotated[str, msgspec.Meta(min_length=1, max_length=200)]
+    details: Annotated[str, msgspec.Meta(max_length=4000)]
+    resource: Annotated[str, msgspec.Meta(min_length=1, max_length=200)]
+    occurred_at: Annotated[str, msgspec.Meta(pattern=_RFC3339.pattern)]
+    runbook_url: Union[str, msgspec.UnsetType] = msgspec.UNSET
+    tags: Union[
+        Annotated[Dict[_TagKey, _TagValue], msgspec.Meta(max_length=20)],
+        msgspec.UnsetType,
+    ] = msgspec.UNSET
+
+    def __post_init__(self) -> None:
+        for field, charset in _CHARSET_VALIDATORS.items():
+            if not _charset_ok(getattr(self, field), charset):
+                raise ValueError(f"{field} does not match {charset[0]!r}")
+        if self.runbook_url is not msgspec.UNSET and not self.runbook_url.startswith(_RUNBOOK_URL_PREFIXES):
+            raise ValueError("runbook_url must start with http:// or https://")
+        if self.tags is not msgspec.UNSET:
+            for key in self.tags:
+                if not _charset_ok(key, _TAG_KEY_CHARSET):
+                    raise ValueError(f"tag key {key!r} does not match {_TAG_KEY_CHARSET[0]!r}")
+
+
+_ALERT_DECODER = msgspec.json.Decoder(Alert)
+
+
+def load_alert(body: bytes) -> Tuple[Any, bool]:
+    # Returns (payload, schema_checked). A well-formed alert is parsed and
+    # validated by msgspec in one pass; anything else is re-parsed with orjson so
+    # validate_alert can report every field error. Malformed JSON raises
+    # ValueError from either parser.
+    try:
+        return msgspec.to_builtins(_ALERT_DECODER.decode(body)), True
+    except msgspec.ValidationError:
+        return orjson.loads(body), False
+
+
 def _format_error_message(error: jsonschema.ValidationError) -> str:
     if error.validator == "const" and list(error.path) == ["severity"]:
         return "must be exactly 'CRITICAL'"
-    if error.validator == "format" and list(error.path) == ["occurred_at"]:
-        return "must be RFC3339 timestamp"
     return error.message
 
 
-def validate_alert(payload: Any) -> Tuple[bool, Dict[str, str]]:
-    validator = jsonschema.Draft202012Validator(INCOMING_ALERT_SCHEMA)
-    errors = sorted(validator.iter_errors(payload), key=lambda e: list(e.path))
+def _collect_field_errors(payload: Any) -> Dict[str, str]:
     field_errors: Dict[str, str] = {}
 
-    for error in errors:
+    for error in _INCOMING_VALIDATOR.iter_errors(payload):
         if error.validator == "additionalProperties":
-            extras = re.findall(r"'([^']+)'", error.message)
-            for extra in extras:
+            # Taken from the instance rather than parsed out of error.message,
+            # which cannot represent names that are empty or contain quotes.
+            properties = error.schema.get("properties", {})
+            for extra in error.instance:
+                if extra in properties:
+                    continue
                 if extra not in field_errors:
                     field_errors[extra] = "unknown field"
             continue
@@ -109,4 +192,37 @@ def validate_alert(payload: Any) -> Tuple[bool, Dict[str, str]]:
         if path not in field_errors:
             field_errors[path] = _format_error_message(error)
 
+    return field_errors
+
+
+def _check_fields(payload: Dict[str, Any], field_errors: Dict[str, str]) -> None:
+    for field, charset in _CHARSET_VALIDATORS.items():
+        value = payload.get(field)
+        if isinstance(value, str) and field not in field_errors and not _charset_ok(value, charset):
+            field_errors[field] = f"{value!r} does not match {charset[0]!r}"
+
+    occurred_at = payload.get("occurred_at")
+    if isinstance(occurred_at, str) and "occurred_at" not in field_errors:
+        if not _RFC3339.match(occurred_at):
+            field_errors["occurred_at"] = "must be RFC3339 timestamp"
+
+    runbook_url = payload.get("runbook_url")
+    if isinstance(runbook_url, str) and "runbook_url" not in field_errors:
+        if not runbook_url.startswith(_RUNBOOK_URL_PREFIXES):
+            field_errors["runbook_url"] = "must start with http:// or https://"
+
+    tags = payload.get("tags")
+    if isinstance(tags, dict):
+        for key in tags:
+            if len(key) > _TAG_KEY_MAX_LENGTH or not _charset_ok(key, _TAG_KEY_CHARSET):
+                if key not in field_errors:
+                    field_errors[key] = "unknown field"
+
+
+def validate_alert(payload: Any) -> Tuple[bool, Dict[str, str]]:
+    # Only reached for bodies the Alert decoder rejected, so the payload is
+    # almost always invalid; collect every field error directly.
+    field_errors = _collect_field_errors(payload)
+    if isinstance(payload, dict):
+        _check_fields(payload, field_errors)
     return len(field_errors) == 0, field_errors
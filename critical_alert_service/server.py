@@ -1,17 +1,51 @@
 from __future__ import annotations
 
-from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
-import json
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import formatdate
+import functools
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import hmac
+import io
+import operator
+import os
+import queue
+import selectors
+import socket
+import sys
+import threading
 import time
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
 
+import orjson
 import requests
-import ulid
 
 from .config import Config
-from .mailmux import send_mailmux
-from .policy import DedupeStore, RateLimiter, dedupe_key, rate_limit_key
-from .schema import validate_alert
+from .mailmux import MailmuxClient
+from .policy import DedupeStore, RateLimiter, policy_keys
+from .schema import load_alert, validate_alert
+
+_SERVER_VERSION = "critical-alert-service/1"
+_PROTOCOL_VERSION = "HTTP/1.1"
+_ALERTS_PATH = "/v1/alerts"
+_SOCKET_TIMEOUT_SECONDS = 10
+_REQUEST_DEADLINE_SECONDS = 10
+_IDLE_TIMEOUT_SECONDS = 10
+_LOG_BATCH_MAX = 256
+_LOG_QUEUE_MAX = 8192
+_ACCESS_LOG_LINE = (
+    "timestamp=%d request_id=%s method=%s path=%s auth_result=%s validation_result=%s "
+    "policy_result=%s mailmux_status=%s latency_ms=%d\n"
+)
+_CROCKFORD_BASE32 = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+_ULID_PAIRS = tuple(a + b for a in _CROCKFORD_BASE32 for b in _CROCKFORD_BASE32)
+_AUTH_CHECK = {
+    "token": lambda token_valid, secret_valid: token_valid,
+    "secret": lambda token_valid, secret_valid: secret_valid,
+    "either": operator.or_,
+    "both": operator.and_,
+}
 
 
 class Policy:
@@ -22,6 +56,266 @@ class Policy:
             config.rate_limit_window_seconds,
             config.policy_store_max_keys,
         )
+        # Invariant header values for policy rejections.
+        self.dedupe_window_header = str(config.dedupe_window_seconds)
+        self.rate_limit_max_header = str(config.rate_limit_max)
+        # Credentials are compared as bytes with hmac.compare_digest; header
+        # values arrive latin-1 decoded, so they are re-encoded the same way.
+        self.auth_tokens = tuple(token.encode("utf-8") for token in frozenset(config.auth_bearer_tokens))
+        self.auth_secret = config.auth_shared_secret.encode("utf-8") if config.auth_shared_secret else None
+
+
+class AccessLogWriter:
+    # Handler threads only enqueue; a single writer thread drains up to
+    # _LOG_BATCH_MAX lines per write so stdout is never contended per request.
+    # If stdout falls behind and _LOG_QUEUE_MAX lines are pending, new lines
+    # are dropped rather than blocking request handling, and the writer logs
+    # how many were lost. The size check is unlocked, so the bound can be
+    # overshot by at most one line per handler thread.
+    def __init__(self, stream: BinaryIO) -> None:
+        self._stream = stream
+        self._queue: "queue.SimpleQueue[Optional[bytes]]" = queue.SimpleQueue()
+        self._dropped = 0
+        self._dropped_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="access-log", daemon=True)
+        self._thread.start()
+
+    def write(self, line: bytes) -> None:
+        if self._queue.qsize() < _LOG_QUEUE_MAX:
+            self._queue.put(line)
+            return
+        with self._dropped_lock:
+            self._dropped += 1
+
+    def _take_dropped(self) -> int:
+        with self._dropped_lock:
+            dropped, self._dropped = self._dropped, 0
+        return dropped
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        get = self._queue.get
+        get_nowait = self._queue.get_nowait
+        while True:
+            item = get()
+            batch: List[bytes] = []
+            while item is not None:
+                batch.append(item)
+                if len(batch) >= _LOG_BATCH_MAX:
+                    break
+                try:
+                    item = get_nowait()
+                except queue.Empty:
+                    break
+            dropped = self._take_dropped() if self._dropped else 0
+            if dropped:
+                batch.append(b"access_log_dropped=%d\n" % dropped)
+            if batch:
+                self._stream.write(b"".join(batch))
+                self._stream.flush()
+            if item is None:
+                return
+
+
+class _DeadlineReader(io.RawIOBase):
+    # Raw request stream. While a deadline is set, each recv waits only for the
+    # time left, so a peer trickling bytes cannot stretch one request past it.
+    def __init__(self, sock: socket.socket, timeout: float) -> None:
+        super().__init__()
+        self._sock = sock
+        self._timeout = timeout
+        self.deadline: Optional[float] = None
+        self.nonblocking = False
+        self.eof = False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> Optional[int]:
+        if self.nonblocking:
+            self._sock.settimeout(0)
+            try:
+                n = self._sock.recv_into(buffer)
+            except BlockingIOError:
+                return None
+            finally:
+                self._sock.settimeout(self._timeout)
+            self.eof = n == 0
+            return n
+        deadline = self.deadline
+        if deadline is None:
+            return self._sock.recv_into(buffer)
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError("request deadline exceeded")
+        self._sock.settimeout(remaining)
+        try:
+            return self._sock.recv_into(buffer)
+        finally:
+            self._sock.settimeout(self._timeout)
+
+
+class PooledHTTPServer(HTTPServer):
+    # serve_forever runs a dispatcher: every open connection that is not in the
+    # middle of a request is parked in a selector, and only becomes a job for
+    # the worker pool once it is readable. Idle clients therefore never hold a
+    # worker. Parked connections are closed after _IDLE_TIMEOUT_SECONDS, and at
+    # max_connections the listening socket is not polled, so new connections
+    # wait in the kernel backlog. Only the dispatcher thread touches the
+    # selector and the parked set; workers hand connections back via a queue.
+    request_queue_size = socket.SOMAXCONN
+
+    def __init__(self, server_address: Tuple[str, int], handler_class: Any, max_workers: int,
+                 max_connections: int) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="http")
+        self._free_workers = threading.BoundedSemaphore(max_workers)
+        self._max_connections = max_connections
+        self._open_connections = 0
+        self._parked: "OrderedDict[socket.socket, float]" = OrderedDict()
+        self._handoff: "queue.SimpleQueue[Tuple[socket.socket, Any, bool]]" = queue.SimpleQueue()
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+        self._stopping = threading.Event()
+        self._stopped = threading.Event()
+        self._stopped.set()
+        self._serving_thread: Optional[threading.Thread] = None
+        self.access_log = AccessLogWriter(sys.stdout.buffer)
+        super().__init__(server_address, handler_class)
+
+    def get_request(self) -> Tuple[socket.socket, Any]:
+        request, client_address = super().get_request()
+        request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return request, client_address
+
+    def serve_forever(self, poll_interval: float = 0.5) -> None:
+        self._stopping.clear()
+        self._stopped.clear()
+        self._serving_thread = threading.current_thread()
+        try:
+            with selectors.DefaultSelector() as selector:
+                selector.register(self._wake_r, selectors.EVENT_READ)
+                listening = False
+                while not self._stopping.is_set():
+                    self._collect_handoffs(selector)
+                    timeout = self._close_expired(selector, poll_interval)
+                    if listening != (self._open_connections < self._max_connections):
+                        listening = not listening
+                        if listening:
+                            selector.register(self.socket, selectors.EVENT_READ)
+                        else:
+                            selector.unregister(self.socket)
+                    for key, _ in selector.select(timeout):
+                        if key.fileobj is self._wake_r:
+                            self._drain_wakeups()
+                        elif key.fileobj is self.socket:
+                            self._accept(selector)
+                        elif not self._dispatch(selector, key.fileobj, key.data):
+                            break
+        finally:
+            self._serving_thread = None
+            self._stopped.set()
+
+    def shutdown(self) -> None:
+        self._stopping.set()
+        self._wake()
+        # Called from the serving thread itself (e.g. a signal handler), the
+        # loop exits as soon as the handler returns; waiting would deadlock.
+        if threading.current_thread() is not self._serving_thread:
+            self._stopped.wait()
+
+    def server_close(self) -> None:
+        super().server_close()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        while True:
+            try:
+                request, _, _ = self._handoff.get_nowait()
+            except queue.Empty:
+                break
+            self.shutdown_request(request)
+        for request in self._parked:
+            self.shutdown_request(request)
+        self._parked.clear()
+        self._wake_r.close()
+        self._wake_w.close()
+        self.access_log.close()
+
+    def _wake(self) -> None:
+        try:
+            self._wake_w.send(b"\0")
+        except (BlockingIOError, OSError):
+            pass
+
+    def _drain_wakeups(self) -> None:
+        try:
+            while self._wake_r.recv(4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def _park(self, selector: selectors.BaseSelector, request: socket.socket, client_address: Any) -> None:
+        selector.register(request, selectors.EVENT_READ, client_address)
+        self._parked[request] = time.monotonic() + _IDLE_TIMEOUT_SECONDS
+
+    def _close(self, request: socket.socket) -> None:
+        self.shutdown_request(request)
+        self._open_connections -= 1
+
+    def _accept(self, selector: selectors.BaseSelector) -> None:
+        try:
+            request, client_address = self.get_request()
+        except OSError:
+            return
+        self._open_connections += 1
+        self._park(selector, request, client_address)
+
+    def _dispatch(self, selector: selectors.BaseSelector, request: socket.socket, client_address: Any) -> bool:
+        selector.unregister(request)
+        del self._parked[request]
+        # Waiting here while the pool is saturated also stops accepting.
+        while not self._free_workers.acquire(timeout=0.5):
+            if self._stopping.is_set():
+                self._close(request)
+                return False
+        self._executor.submit(self._serve_connection, request, client_address)
+        return True
+
+    def _serve_connection(self, request: socket.socket, client_address: Any) -> None:
+        keep_alive = False
+        try:
+            keep_alive = self.RequestHandlerClass(request, client_address, self).keep_alive
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self._handoff.put((request, client_address, keep_alive))
+            self._free_workers.release()
+            self._wake()
+
+    def _collect_handoffs(self, selector: selectors.BaseSelector) -> None:
+        while True:
+            try:
+                request, client_address, keep_alive = self._handoff.get_nowait()
+            except queue.Empty:
+                return
+            if keep_alive:
+                self._park(selector, request, client_address)
+            else:
+                self._close(request)
+
+    def _close_expired(self, selector: selectors.BaseSelector, poll_interval: float) -> float:
+        # _parked is in parking order, which is also idle-deadline order.
+        now = time.monotonic()
+        while self._parked:
+            request, deadline = next(iter(self._parked.items()))
+            if deadline > now:
+                return min(poll_interval, deadline - now)
+            selector.unregister(request)
+            del self._parked[request]
+            self._close(request)
+        return poll_interval
 
 
 def _json_body(ok: bool, request_id: str, result: Optional[str] = None, error: Optional[Dict[str, Any]] = None,
@@ -51,181 +345,311 @@ def _error_body(error_type: str, code: str, message: str, details: Optional[Dict
     return body
 
 
+_RID_PLACEHOLDER = "__RID__"
+
+
+def _error_template(error_type: str, code: str, message: str) -> bytes:
+    return orjson.dumps(_json_body(False, _RID_PLACEHOLDER, error=_error_body(error_type, code, message)))
+
+
+_ERROR_TEMPLATES: Dict[str, bytes] = {
+    "UNSUPPORTED_MEDIA_TYPE": _error_template(
+        "VALIDATION", "UNSUPPORTED_MEDIA_TYPE", "Content-Type must be application/json."
+    ),
+    "AUTH_INVALID": _error_template(
+        "AUTH", "AUTH_INVALID", "Authentication failed: missing or invalid credentials."
+    ),
+    "LENGTH_REQUIRED": _error_template("VALIDATION", "LENGTH_REQUIRED", "Content-Length header is required."),
+    "TRANSFER_ENCODING_UNSUPPORTED": _error_template(
+        "VALIDATION", "TRANSFER_ENCODING_UNSUPPORTED", "Transfer-Encoding is not supported; send Content-Length."
+    ),
+    "PAYLOAD_TOO_LARGE": _error_template("VALIDATION", "PAYLOAD_TOO_LARGE", "Request body exceeded maximum size."),
+    "JSON_INVALID": _error_template("VALIDATION", "JSON_INVALID", "Request body is not valid JSON."),
+    "INTERNAL": _error_template("INTERNAL", "INTERNAL", "Unexpected server error."),
+}
+_RID_PLACEHOLDER_JSON = orjson.dumps(_RID_PLACEHOLDER)
+_DELIVERED_TEMPLATE = b'{"ok":true,"request_id":%s,"result":"DELIVERED","mailmux":{"status":%d}}'
+
+_STATUS_PHRASES: Dict[int, bytes] = {status.value: status.phrase.encode("latin-1") for status in HTTPStatus}
+_JSON_RESPONSE_HEADERS = b"Content-Type: application/json\r\nServer: " + _SERVER_VERSION.encode("latin-1") + b"\r\n"
+_PROTOCOL = _PROTOCOL_VERSION.encode("latin-1")
+_BEARER_PREFIXES = frozenset(("Bearer ", "bearer ", "BEARER "))
+_WWW_AUTHENTICATE_HEADER = b'WWW-Authenticate: Bearer realm="critical-alert-service"\r\n'
+_CONNECTION_CLOSE_HEADER = b"Connection: close\r\n"
+
+
+def _empty_response(status: int, headers: bytes = b"") -> bytes:
+    return b"%s %d %s\r\n%sContent-Length: 0\r\n\r\n" % (_PROTOCOL, status, _STATUS_PHRASES[status], headers)
+
+
+_RESP_404 = _empty_response(404)
+_RESP_404_CLOSE = _empty_response(404, _CONNECTION_CLOSE_HEADER)
+_RESP_405 = _empty_response(405, b"Allow: POST\r\n")
+_RESP_405_CLOSE = _empty_response(405, b"Allow: POST\r\n" + _CONNECTION_CLOSE_HEADER)
+
+
+@functools.lru_cache(maxsize=2)
+def _http_date(second: int) -> bytes:
+    return formatdate(second, usegmt=True).encode("latin-1")
+
+
+def _raw_response(status: int, request_id: str, body: bytes,
+                  extra_headers: Optional[Dict[str, str]], include_www_auth: bool, close: bool) -> bytes:
+    parts = [
+        b"%s %d %s\r\n" % (_PROTOCOL, status, _STATUS_PHRASES[status]),
+        _JSON_RESPONSE_HEADERS,
+        b"Date: %s\r\nX-Request-Id: %s\r\n" % (_http_date(int(time.time())), request_id.encode("latin-1")),
+    ]
+    if include_www_auth:
+        parts.append(_WWW_AUTHENTICATE_HEADER)
+    if extra_headers:
+        for key, value in extra_headers.items():
+            parts.append(f"{key}: {value}\r\n".encode("latin-1"))
+    if close:
+        parts.append(_CONNECTION_CLOSE_HEADER)
+    parts.append(b"Content-Length: %d\r\n\r\n" % len(body))
+    parts.append(body)
+    return b"".join(parts)
+
+
 def _now_ms() -> int:
-    return int(time.time() * 1000)
+    return time.monotonic_ns() // 1_000_000
+
+
+def _fast_ulid() -> str:
+    # 48-bit millisecond timestamp (10 chars) + 80 random bits (16 chars),
+    # emitted two Crockford base32 digits at a time from a 1024-entry table.
+    ms = time.time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10), "big")
+    pairs = _ULID_PAIRS
+    return (
+        pairs[ms >> 40] + pairs[(ms >> 30) & 1023] + pairs[(ms >> 20) & 1023]
+        + pairs[(ms >> 10) & 1023] + pairs[ms & 1023]
+        + pairs[rand >> 70] + pairs[(rand >> 60) & 1023] + pairs[(rand >> 50) & 1023]
+        + pairs[(rand >> 40) & 1023] + pairs[(rand >> 30) & 1023] + pairs[(rand >> 20) & 1023]
+        + pairs[(rand >> 10) & 1023] + pairs[rand & 1023]
+    )
 
 
 def _extract_bearer_token(auth_header: Optional[str]) -> Optional[str]:
     if not auth_header:
         return None
+    if auth_header[:7] in _BEARER_PREFIXES:
+        # Header values are latin-1, where every whitespace character other
+        # than " " is non-printable, so this matches the split() parse below.
+        token = auth_header[7:].strip()
+        if token and " " not in token and token.isprintable():
+            return token
     parts = auth_header.split()
     if len(parts) != 2 or parts[0].lower() != "bearer":
         return None
     return parts[1]
 
 
-def create_server(config: Config) -> ThreadingHTTPServer:
+def create_server(config: Config) -> PooledHTTPServer:
     policy = Policy(config)
+    mailmux = MailmuxClient(config)
+    auth_check = _AUTH_CHECK[config.auth_mode]
 
     class Handler(BaseHTTPRequestHandler):
-        server_version = "critical-alert-service/1"
+        server_version = _SERVER_VERSION
+        protocol_version = _PROTOCOL_VERSION
         sys_version = ""
+        timeout = _SOCKET_TIMEOUT_SECONDS
 
         def log_message(self, format: str, *args: Any) -> None:
             return
 
+        def setup(self) -> None:
+            super().setup()
+            self.rfile.close()
+            self._reader = _DeadlineReader(self.connection, self.timeout)
+            self.rfile = io.BufferedReader(self._reader)
+
+        keep_alive = False
+
+        def handle(self) -> None:
+            # Serve requests while input is already buffered (pipelining);
+            # otherwise hand a keep-alive connection back to the dispatcher
+            # rather than blocking this worker until the next request.
+            self.close_connection = True
+            self.handle_one_request()
+            while not self.close_connection:
+                if not self._input_pending():
+                    self.keep_alive = not self._reader.eof
+                    return
+                self.handle_one_request()
+
+        def _input_pending(self) -> bool:
+            self._reader.nonblocking = True
+            try:
+                return bool(self.rfile.peek(1))
+            finally:
+                self._reader.nonblocking = False
+
+        def handle_one_request(self) -> None:
+            # The request line, headers and body must all arrive within
+            # _REQUEST_DEADLINE_SECONDS; the socket timeout still bounds writes.
+            self._reader.deadline = time.monotonic() + _REQUEST_DEADLINE_SECONDS
+            try:
+                super().handle_one_request()
+            finally:
+                self._reader.deadline = None
+
         def _send_json(self, status: int, payload: Dict[str, Any], request_id: str,
                        extra_headers: Optional[Dict[str, str]] = None, include_www_auth: bool = False) -> None:
-            body = json.dumps(payload).encode("utf-8")
-            self.send_response(status)
-            self.send_header("Content-Type", "application/json")
-            self.send_header("X-Request-Id", request_id)
-            if include_www_auth:
-                self.send_header("WWW-Authenticate", 'Bearer realm="critical-alert-service"')
-            if extra_headers:
-                for key, value in extra_headers.items():
-                    self.send_header(key, value)
-            self.end_headers()
-            self.wfile.write(body)
+            self._send_body(status, orjson.dumps(payload), request_id, extra_headers, include_www_auth)
+
+        def _send_json_prebuilt(self, status: int, template: bytes, request_id: str,
+                                include_www_auth: bool = False) -> None:
+            body = template.replace(_RID_PLACEHOLDER_JSON, orjson.dumps(request_id), 1)
+            self._send_body(status, body, request_id, None, include_www_auth)
+
+        def _send_body(self, status: int, body: bytes, request_id: str,
+                       extra_headers: Optional[Dict[str, str]], include_www_auth: bool) -> None:
+            self.wfile.write(
+                _raw_response(status, request_id, body, extra_headers, include_www_auth, self.close_connection)
+            )
+
+        def _declares_body(self) -> bool:
+            # Whether the framing headers announce a body, whatever the method.
+            # A request that does and whose body is not read must close the
+            # connection, or the body would be parsed as the next request.
+            headers = self.headers
+            if "Transfer-Encoding" in headers:
+                return True
+            return any(value.strip() != "0" for value in headers.get_all("Content-Length", ()))
 
         def _read_body(self) -> Tuple[Optional[bytes], Optional[str]]:
-            length_header = self.headers.get("Content-Length")
-            if length_header:
-                try:
-                    length = int(length_header)
-                except ValueError:
-                    return None, "invalid content-length"
-                if length > config.max_body_bytes:
-                    return None, "too_large"
-                data = self.rfile.read(length)
-            else:
-                data = self.rfile.read(config.max_body_bytes + 1)
-            if len(data) > config.max_body_bytes:
+            headers = self.headers
+            if "Transfer-Encoding" in headers:
+                return None, "transfer_encoding"
+            length_headers = headers.get_all("Content-Length")
+            if not length_headers:
+                return None, "length_required"
+            # Exactly one plain decimal length: int() alone would also take
+            # signs, underscores and non-ASCII digits.
+            length_header = length_headers[0].strip()
+            if len(length_headers) > 1 or not (length_header.isascii() and length_header.isdigit()):
+                return None, "invalid content-length"
+            length = int(length_header)
+            if length > config.max_body_bytes:
                 return None, "too_large"
-            return data, None
-
-        def _auth_ok(self) -> bool:
-            token = _extract_bearer_token(self.headers.get("Authorization"))
-            secret_header_value = self.headers.get(config.auth_secret_header_name)
-
-            token_valid = token in config.auth_bearer_tokens if token else False
-            secret_valid = secret_header_value == config.auth_shared_secret if secret_header_value else False
-
-            if config.auth_mode == "token":
-                return token_valid
-            if config.auth_mode == "secret":
-                return secret_valid
-            if config.auth_mode == "either":
-                return token_valid or secret_valid
-            if config.auth_mode == "both":
-                return token_valid and secret_valid
-            return False
+            buf = bytearray(length)
+            view = memoryview(buf)
+            received = 0
+            while received < length:
+                n = self.rfile.readinto(view[received:])
+                if not n:
+                    break
+                received += n
+            view.release()
+            if received < length:
+                del buf[received:]
+            return buf, None
+
+        def _auth_ok(self, auth_header: Optional[str], secret_header_value: Optional[str]) -> bool:
+            token = _extract_bearer_token(auth_header)
+            token_valid = False
+            if token:
+                presented = token.encode("latin-1")
+                token_valid = any(hmac.compare_digest(presented, valid) for valid in policy.auth_tokens)
+            secret_valid = False
+            if secret_header_value and policy.auth_secret is not None:
+                secret_valid = hmac.compare_digest(secret_header_value.encode("latin-1"), policy.auth_secret)
+            return auth_check(token_valid, secret_valid)
 
         def do_POST(self) -> None:
             start_ms = _now_ms()
-            request_id = self.headers.get(config.request_id_header) or str(ulid.new())
+            request_headers = self.headers
+            request_id = request_headers.get(config.request_id_header) or _fast_ulid()
             auth_result = "ok"
             validation_result = "ok"
             policy_result = "accepted"
             mailmux_status: Optional[int] = None
 
             try:
-                if self.path != "/v1/alerts":
-                    self.send_response(404)
-                    self.end_headers()
+                # Any rejection before the body has been read leaves it on the
+                # wire, so those responses also close the connection.
+                if self.path != _ALERTS_PATH:
+                    self.close_connection = True
+                    self.wfile.write(_RESP_404_CLOSE)
                     return
 
-                content_type = self.headers.get("Content-Type", "")
+                content_type = request_headers.get("Content-Type", "")
                 if not content_type.lower().startswith("application/json"):
                     validation_result = "fail"
-                    error = _error_body(
-                        "VALIDATION",
-                        "UNSUPPORTED_MEDIA_TYPE",
-                        "Content-Type must be application/json.",
-                    )
-                    payload = _json_body(False, request_id, error=error)
-                    self._send_json(415, payload, request_id)
+                    self.close_connection = True
+                    self._send_json_prebuilt(415, _ERROR_TEMPLATES["UNSUPPORTED_MEDIA_TYPE"], request_id)
                     return
 
-                if not self._auth_ok():
+                if not self._auth_ok(request_headers.get("Authorization"), request_headers.get(config.auth_secret_header_name)):
                     auth_result = "fail"
-                    error = _error_body(
-                        "AUTH",
-                        "AUTH_INVALID",
-                        "Authentication failed: missing or invalid credentials.",
-                    )
-                    payload = _json_body(False, request_id, error=error)
-                    self._send_json(401, payload, request_id, include_www_auth=True)
+                    self.close_connection = True
+                    self._send_json_prebuilt(401, _ERROR_TEMPLATES["AUTH_INVALID"], request_id, include_www_auth=True)
                     return
 
                 body, body_err = self._read_body()
-                if body_err == "too_large":
+                if body_err:
+                    self.close_connection = True
+                if body_err == "transfer_encoding":
                     validation_result = "fail"
-                    error = _error_body(
-                        "VALIDATION",
-                        "PAYLOAD_TOO_LARGE",
-                        "Request body exceeded maximum size.",
-                    )
-                    payload = _json_body(False, request_id, error=error)
-                    self._send_json(413, payload, request_id)
+                    self._send_json_prebuilt(400, _ERROR_TEMPLATES["TRANSFER_ENCODING_UNSUPPORTED"], request_id)
                     return
-                if body_err:
+                if body_err == "length_required":
                     validation_result = "fail"
-                    error = _error_body(
-                        "VALIDATION",
-                        "JSON_INVALID",
-                        "Request body is not valid JSON.",
-                    )
-                    payload = _json_body(False, request_id, error=error)
-                    self._send_json(400, payload, request_id)
+                    self._send_json_prebuilt(411, _ERROR_TEMPLATES["LENGTH_REQUIRED"], request_id)
                     return
-
-                try:
-                    payload_json = json.loads(body.decode("utf-8"))
-                except json.JSONDecodeError:
+                if body_err == "too_large":
                     validation_result = "fail"
-                    error = _error_body(
-                        "VALIDATION",
-                        "JSON_INVALID",
-                        "Request body is not valid JSON.",
-                    )
-                    payload = _json_body(False, request_id, error=error)
-                    self._send_json(400, payload, request_id)
+                    self._send_json_prebuilt(413, _ERROR_TEMPLATES["PAYLOAD_TOO_LARGE"], request_id)
                     return
-
-                try:
-                    valid, field_errors = validate_alert(payload_json)
-                except AttributeError:
+                if body_err:
                     validation_result = "fail"
-                    error = _error_body(
-                        "VALIDATION",
-                        "SCHEMA_INVALID",
-                        "Request body failed validation.",
-                        {"field_errors": {"_": "schema validation error"}},
-                    )
-                    payload = _json_body(False, request_id, error=error)
-                    self._send_json(400, payload, request_id)
+                    self._send_json_prebuilt(400, _ERROR_TEMPLATES["JSON_INVALID"], request_id)
                     return
-                if not valid:
+
+                try:
+                    payload_json, schema_checked = load_alert(body)
+                except ValueError:
                     validation_result = "fail"
-                    error = _error_body(
-                        "VALIDATION",
-                        "SCHEMA_INVALID",
-                        "Request body failed validation.",
-                        {"field_errors": field_errors},
-                    )
-                    payload = _json_body(False, request_id, error=error)
-                    self._send_json(400, payload, request_id)
+                    self._send_json_prebuilt(400, _ERROR_TEMPLATES["JSON_INVALID"], request_id)
                     return
 
-                dkey = dedupe_key(payload_json)
+                if not schema_checked:
+                    try:
+                        valid, field_errors = validate_alert(payload_json)
+                    except AttributeError:
+                        validation_result = "fail"
+                        error = _error_body(
+                            "VALIDATION",
+                            "SCHEMA_INVALID",
+                            "Request body failed validation.",
+                            {"field_errors": {"_": "schema validation error"}},
+                        )
+                        payload = _json_body(False, request_id, error=error)
+                        self._send_json(400, payload, request_id)
+                        return
+                    if not valid:
+                        validation_result = "fail"
+                        error = _error_body(
+                            "VALIDATION",
+                            "SCHEMA_INVALID",
+                            "Request body failed validation.",
+                            {"field_errors": field_errors},
+                        )
+                        payload = _json_body(False, request_id, error=error)
+                        self._send_json(400, payload, request_id)
+                        return
+
+                dkey, rkey = policy_keys(payload_json)
                 dedupe_result = policy.dedupe.check(dkey)
                 if dedupe_result.deduped:
                     policy_result = "deduped"
                     headers = {
                         "X-Policy-Result": "deduped",
                         "X-Dedupe-Key": dedupe_result.dedupe_key,
-                        "X-Dedupe-Window-Seconds": str(config.dedupe_window_seconds),
+                        "X-Dedupe-Window-Seconds": policy.dedupe_window_header,
                     }
                     if dedupe_result.retry_after is not None:
                         headers["Retry-After"] = str(dedupe_result.retry_after)
@@ -242,13 +666,12 @@ def create_server(config: Config) -> ThreadingHTTPServer:
                     self._send_json(409, payload, request_id, extra_headers=headers)
                     return
 
-                rkey = rate_limit_key(payload_json)
                 rate_result = policy.rate_limit.check(rkey)
                 if rate_result.rate_limited:
                     policy_result = "rate_limited"
                     headers = {
                         "X-Policy-Result": "rate_limited",
-                        "X-RateLimit-Limit": str(config.rate_limit_max),
+                        "X-RateLimit-Limit": policy.rate_limit_max_header,
                         "X-RateLimit-Remaining": "0",
                     }
                     if rate_result.reset_at is not None:
@@ -270,7 +693,7 @@ def create_server(config: Config) -> ThreadingHTTPServer:
                     return
 
                 try:
-                    status, _ = send_mailmux(config, payload_json, request_id)
+                    status, _ = mailmux.send(payload_json, request_id)
                     mailmux_status = status
                 except requests.Timeout:
                     error = _error_body(
@@ -294,8 +717,8 @@ def create_server(config: Config) -> ThreadingHTTPServer:
                     return
 
                 if 200 <= mailmux_status < 300:
-                    payload = _json_body(True, request_id, result="DELIVERED", mailmux_status=mailmux_status)
-                    self._send_json(202, payload, request_id)
+                    body = _DELIVERED_TEMPLATE % (orjson.dumps(request_id), mailmux_status)
+                    self._send_body(202, body, request_id, None, False)
                     return
 
                 error = _error_body(
@@ -307,25 +730,29 @@ def create_server(config: Config) -> ThreadingHTTPServer:
                 payload = _json_body(False, request_id, error=error)
                 self._send_json(502, payload, request_id)
 
+            except TimeoutError:
+                validation_result = "fail"
+                self.close_connection = True
             except Exception:
-                error = _error_body(
-                    "INTERNAL",
-                    "INTERNAL",
-                    "Unexpected server error.",
-                )
-                payload = _json_body(False, request_id, error=error)
-                self._send_json(500, payload, request_id)
+                self.close_connection = True
+                self._send_json_prebuilt(500, _ERROR_TEMPLATES["INTERNAL"], request_id)
             finally:
                 latency_ms = _now_ms() - start_ms
-                print(
-                    f"timestamp={int(time.time())} request_id={request_id} method={self.command} "
-                    f"path={self.path} auth_result={auth_result} validation_result={validation_result} "
-                    f"policy_result={policy_result} mailmux_status={mailmux_status} latency_ms={latency_ms}",
-                    flush=True,
+                line = _ACCESS_LOG_LINE % (
+                    time.time_ns() // 1_000_000_000, request_id, self.command, self.path, auth_result,
+                    validation_result, policy_result, mailmux_status, latency_ms,
                 )
+                self.server.access_log.write(line.encode("utf-8"))
+
+        def _reject_method(self) -> None:
+            # The body, if any, is never read here.
+            if self._declares_body():
+                self.close_connection = True
+            if self.close_connection:
+                self.wfile.write(_RESP_405_CLOSE if self.path == _ALERTS_PATH else _RESP_404_CLOSE)
+            else:
+                self.wfile.write(_RESP_405 if self.path == _ALERTS_PATH else _RESP_404)
 
-        def do_GET(self) -> None:
-            self.send_response(404)
-            self.end_headers()
+        do_GET = do_PUT = do_PATCH = do_DELETE = _reject_method
 
-    return ThreadingHTTPServer(("0.0.0.0", config.port), Handler)
+    return PooledHTTPServer(("0.0.0.0", config.port), Handler, config.http_threads, config.http_max_connections)
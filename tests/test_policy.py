@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import hashlib
+import unittest
+
+from critical_alert_service.policy import dedupe_key, policy_keys, rate_limit_key
+
+ALERT = {
+    "service": "  Payments-API ",
+    "environment": "PROD",
+    "error_code": " DB_CONN_TIMEOUT",
+    "resource": "DB-Primary-1\n",
+    "summary": "  Database   connections\ttiming out ",
+}
+
+
+class PolicyKeysTest(unittest.TestCase):
+    def test_keys_follow_the_design_definition(self) -> None:
+        k = "payments-api|prod|db_conn_timeout|db-primary-1|Database connections timing out"
+        expected_dedupe = hashlib.blake2b(k.encode("utf-8"), digest_size=16).hexdigest()
+        self.assertEqual(policy_keys(ALERT), (expected_dedupe, "payments-api|db_conn_timeout"))
+        self.assertEqual(dedupe_key(ALERT), expected_dedupe)
+        self.assertEqual(rate_limit_key(ALERT), "payments-api|db_conn_timeout")
+
+    def test_summary_case_is_significant(self) -> None:
+        self.assertNotEqual(dedupe_key(ALERT), dedupe_key(dict(ALERT, summary="database connections timing out")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import random
+import unittest
+from typing import Any, Dict, List
+
+import orjson
+
+from critical_alert_service.schema import load_alert, validate_alert
+
+VALID_ALERT: Dict[str, Any] = {
+    "severity": "CRITICAL",
+    "service": "payments-api",
+    "environment": "prod",
+    "error_code": "DB_CONN_TIMEOUT",
+    "summary": "Database connections timing out",
+    "details": "p99 connect latency above 5s",
+    "resource": "db-primary-1",
+    "occurred_at": "2026-01-19T22:48:12Z",
+    "runbook_url": "https://runbooks.example.com/db",
+    "tags": {"team": "payments", "region": "us-east-1"},
+}
+
+_IDENTIFIER_VALUES = [
+    "", "a", "A", "0", "-a", ".a", "_a", "a-b", "a.b", "a_b", "a b", "a/b", "a\n", "é", "aé",
+    "A-B_9", "abc", "ABC", "x" * 39, "x" * 40, "x" * 41, "x" * 79, "x" * 80, "x" * 81, "X" * 80, "X" * 81,
+    1, None, True, ["a"], {"a": "b"},
+]
+_TEXT_VALUES = [
+    "", " ", "a", "é", "\U0001f525", "x" * 199, "x" * 200, "x" * 201, "é" * 200, "é" * 201,
+    "x" * 3999, "x" * 4000, "x" * 4001, 0, None, False, [], {},
+]
+_TIMESTAMPS = [
+    "2026-01-19T22:48:12Z", "2026-01-19T22:48:12.123Z", "2026-01-19T22:48:12+02:00", "2026-01-19T22:48:12-05:30",
+    "2026-01-19 22:48:12Z", "2026-01-19T22:48:12", "2026-01-19T22:48Z", "2026-01-19T22:48:12.Z",
+    "2026-01-19T22:48:12z", "2026-01-19T22:48:12Z\n", " 2026-01-19T22:48:12Z", "2026-1-19T22:48:12Z",
+    "٢٠٢٦-01-19T22:48:12Z", "yesterday", "", 1737326892, None,
+]
+_RUNBOOKS = [
+    "https://rb", "http://rb", "https://", "HTTPS://rb", "ftp://rb", "//rb", "rb", "", " https://rb", 5, None,
+]
+_TAG_KEYS = ["a", "A", "0", "a.b", "a-b", "a_b", "-a", ".a", "a b", "", "é", "x" * 40, "x" * 41]
+_TAG_VALUES: List[Any] = ["", "v", "é", "x" * 200, "x" * 201, 5, None, True, [], {}]
+
+_FIELD_VALUES: Dict[str, List[Any]] = {
+    "severity": ["CRITICAL", "critical", "HIGH", "", 1, None],
+    "service": _IDENTIFIER_VALUES,
+    "environment": _IDENTIFIER_VALUES,
+    "error_code": _IDENTIFIER_VALUES,
+    "summary": _TEXT_VALUES,
+    "details": _TEXT_VALUES,
+    "resource": _TEXT_VALUES,
+    "occurred_at": _TIMESTAMPS,
+    "runbook_url": _RUNBOOKS,
+}
+
+
+def _random_tags(rng: random.Random) -> Any:
+    roll = rng.random()
+    if roll < 0.05:
+        return rng.choice(["a=b", 1, None, ["a"]])
+    count = rng.choice([0, 1, 2, 19, 20, 21])
+    tags: Dict[str, Any] = {}
+    for index in range(count):
+        key = rng.choice(_TAG_KEYS) if rng.random() < 0.3 else f"k{index}"
+        tags[key] = rng.choice(_TAG_VALUES) if rng.random() < 0.3 else "v"
+    return tags
+
+
+def _random_alert(rng: random.Random) -> Any:
+    if rng.random() < 0.02:
+        return rng.choice([[], [VALID_ALERT], "alert", 1, None, True])
+    alert = dict(VALID_ALERT)
+    for _ in range(rng.choice([0, 1, 1, 1, 2, 3])):
+        roll = rng.random()
+        if roll < 0.1:
+            alert.pop(rng.choice(list(VALID_ALERT)), None)
+        elif roll < 0.15:
+            alert[rng.choice(["unexpected", "message", "Severity", ""])] = "x"
+        elif roll < 0.3:
+            alert["tags"] = _random_tags(rng)
+        else:
+            field = rng.choice(list(_FIELD_VALUES))
+            alert[field] = rng.choice(_FIELD_VALUES[field])
+    return alert
+
+
+class AlertDecoderMatchesValidatorTest(unittest.TestCase):
+    # load_alert accepts well-formed alerts through the msgspec Alert struct
+    # without running validate_alert, so the two must agree on every body.
+
+    def assert_agrees(self, body: bytes) -> None:
+        decoded, schema_checked = load_alert(body)
+        valid, field_errors = validate_alert(orjson.loads(body))
+        self.assertEqual(schema_checked, valid, (body, field_errors))
+        if schema_checked:
+            self.assertEqual(decoded, orjson.loads(body), body)
+
+    def test_valid_alert_is_accepted_by_the_decoder(self) -> None:
+        decoded, schema_checked = load_alert(orjson.dumps(VALID_ALERT))
+        self.assertTrue(schema_checked)
+        self.assertEqual(decoded, VALID_ALERT)
+
+    def test_single_field_variations(self) -> None:
+        for field, values in _FIELD_VALUES.items():
+            for value in values:
+                with self.subTest(field=field, value=value):
+                    self.assert_agrees(orjson.dumps(dict(VALID_ALERT, **{field: value})))
+
+    def test_tag_variations(self) -> None:
+        for key in _TAG_KEYS:
+            for value in _TAG_VALUES:
+                with self.subTest(key=key, value=value):
+                    self.assert_agrees(orjson.dumps(dict(VALID_ALERT, tags={key: value})))
+        for count in (0, 20, 21):
+            with self.subTest(count=count):
+                tags = {f"k{index}": "v" for index in range(count)}
+                self.assert_agrees(orjson.dumps(dict(VALID_ALERT, tags=tags)))
+
+    def test_randomized_alerts(self) -> None:
+        rng = random.Random(20260119)
+        for _ in range(5000):
+            self.assert_agrees(orjson.dumps(_random_alert(rng)))
+
+
+if __name__ == "__main__":
+    unittest.main()
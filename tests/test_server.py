@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+import dataclasses
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import io
+import signal
+import socket
+import sys
+import threading
+import time
+from typing import Any, BinaryIO, Dict, Optional, Tuple
+import unittest
+from unittest import mock
+
+import orjson
+
+from critical_alert_service import server as server_module
+from critical_alert_service.config import Config
+from critical_alert_service.server import PooledHTTPServer, create_server
+
+from .test_schema import VALID_ALERT
+
+_TOKEN = "test-token-0123456789"
+_ALERT_BODY = orjson.dumps(VALID_ALERT)
+
+_CONFIG = Config(
+    port=0,
+    http_threads=2,
+    http_max_connections=64,
+    max_body_bytes=16384,
+    request_id_header="X-Request-Id",
+    auth_mode="token",
+    auth_bearer_tokens=[_TOKEN],
+    auth_secret_header_name="X-Alert-Secret",
+    auth_shared_secret=None,
+    dedupe_window_seconds=0,
+    rate_limit_max=0,
+    rate_limit_window_seconds=60,
+    policy_store_max_keys=10000,
+    mailmux_base_url="http://127.0.0.1:1",
+    mailmux_send_path="/v1/send",
+    mailmux_timeout_ms=2000,
+    mailmux_auth_mode="none",
+    mailmux_bearer_token=None,
+    mailmux_auth_header_name=None,
+    mailmux_auth_header_value=None,
+    mailmux_to=["ops@example.com"],
+    mailmux_from="critical-alert-service@localhost",
+    mailmux_subject_prefix="[CRITICAL]",
+)
+
+
+def alert_request(body: bytes = _ALERT_BODY, method: str = "POST", headers: Optional[Dict[str, str]] = None) -> bytes:
+    head = {
+        "Host": "localhost",
+        "Content-Type": "application/json",
+        "Authorization": f"Bearer {_TOKEN}",
+        "Content-Length": str(len(body)),
+    }
+    head.update(headers or {})
+    lines = "".join(f"{name}: {value}\r\n" for name, value in head.items() if value is not None)
+    return f"{method} /v1/alerts HTTP/1.1\r\n{lines}\r\n".encode("latin-1") + body
+
+
+def read_response(stream: BinaryIO) -> Tuple[int, Dict[str, str], bytes]:
+    status_line = stream.readline()
+    if not status_line:
+        raise ConnectionError("connection closed before a response")
+    headers: Dict[str, str] = {}
+    while True:
+        line = stream.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    body = stream.read(int(headers.get("content-length", "0")))
+    return int(status_line.split()[1]), headers, body
+
+
+class _StubMailmux(BaseHTTPRequestHandler):
+    def do_POST(self) -> None:
+        self.server.deliveries.append(self.rfile.read(int(self.headers["Content-Length"])))
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, format: str, *args: Any) -> None:
+        return
+
+
+class ServerTest(unittest.TestCase):
+    # Runs the real server on an ephemeral port against a stub mailmux and
+    # talks raw HTTP/1.1 to it, so connection reuse and closing are visible.
+
+    def setUp(self) -> None:
+        self.mailmux = ThreadingHTTPServer(("127.0.0.1", 0), _StubMailmux)
+        self.mailmux.deliveries = []
+        threading.Thread(target=self.mailmux.serve_forever, daemon=True).start()
+        self.addCleanup(self.mailmux.server_close)
+        self.addCleanup(self.mailmux.shutdown)
+
+    def create_server(self, **overrides: Any) -> PooledHTTPServer:
+        base_url = "http://127.0.0.1:%d" % self.mailmux.server_address[1]
+        config = dataclasses.replace(_CONFIG, mailmux_base_url=base_url, **overrides)
+        # The access log goes to sys.stdout.buffer; keep it out of test output.
+        stdout = io.TextIOWrapper(io.BytesIO())
+        self.addCleanup(stdout.close)
+        with mock.patch.object(sys, "stdout", stdout):
+            return create_server(config)
+
+    def start_server(self, **overrides: Any) -> int:
+        httpd = self.create_server(**overrides)
+        thread = threading.Thread(target=httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+        thread.start()
+        self.addCleanup(httpd.server_close)
+        self.addCleanup(thread.join)
+        self.addCleanup(httpd.shutdown)
+        return httpd.server_address[1]
+
+    def connect(self, port: int) -> Tuple[socket.socket, BinaryIO]:
+        sock = socket.create_connection(("127.0.0.1", port), timeout=5)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.addCleanup(sock.close)
+        stream = sock.makefile("rb")
+        self.addCleanup(stream.close)
+        return sock, stream
+
+    def assert_closed(self, stream: BinaryIO) -> None:
+        try:
+            self.assertEqual(stream.read(1), b"")
+        except ConnectionResetError:
+            pass
+
+    def test_keep_alive_reuses_the_connection(self) -> None:
+        sock, stream = self.connect(self.start_server())
+        for _ in range(3):
+            sock.sendall(alert_request())
+            status, headers, _ = read_response(stream)
+            self.assertEqual(status, 202)
+            self.assertNotIn("connection", headers)
+        self.assertEqual(len(self.mailmux.deliveries), 3)
+
+    def test_pipelined_requests_are_answered_in_order(self) -> None:
+        sock, stream = self.connect(self.start_server())
+        sock.sendall(alert_request() + alert_request(headers={"Authorization": None}) + alert_request())
+        self.assertEqual(read_response(stream)[0], 202)
+        self.assertEqual(read_response(stream)[0], 401)
+        # The 401 left its body unread and closed the connection.
+        self.assert_closed(stream)
+        self.assertEqual(len(self.mailmux.deliveries), 1)
+
+    def test_request_split_across_packets(self) -> None:
+        sock, stream = self.connect(self.start_server())
+        request = alert_request()
+        for start in range(0, len(request), 40):
+            sock.sendall(request[start:start + 40])
+            time.sleep(0.01)
+        self.assertEqual(read_response(stream)[0], 202)
+
+    def test_idle_connections_are_closed(self) -> None:
+        with mock.patch.object(server_module, "_IDLE_TIMEOUT_SECONDS", 0.2):
+            port = self.start_server()
+            _, silent = self.connect(port)
+            sock, stream = self.connect(port)
+            sock.sendall(alert_request())
+            self.assertEqual(read_response(stream)[0], 202)
+            started = time.monotonic()
+            self.assert_closed(stream)
+            self.assert_closed(silent)
+            self.assertLess(time.monotonic() - started, 2)
+
+    def test_trickled_request_is_dropped_at_the_deadline(self) -> None:
+        with mock.patch.object(server_module, "_REQUEST_DEADLINE_SECONDS", 0.5):
+            sock, stream = self.connect(self.start_server())
+            started = time.monotonic()
+            try:
+                for byte in alert_request():
+                    sock.send(bytes([byte]))
+                    time.sleep(0.05)
+            except OSError:
+                pass
+            self.assertLess(time.monotonic() - started, 3)
+            self.assert_closed(stream)
+        self.assertEqual(self.mailmux.deliveries, [])
+
+    def test_connections_beyond_the_cap_wait_in_the_backlog(self) -> None:
+        port = self.start_server(http_max_connections=1)
+        first, first_stream = self.connect(port)
+        time.sleep(0.2)
+        sock, stream = self.connect(port)
+        sock.sendall(alert_request())
+        sock.settimeout(0.5)
+        with self.assertRaises(TimeoutError):
+            sock.recv(1, socket.MSG_PEEK)
+        first_stream.close()
+        first.close()
+        sock.settimeout(5)
+        self.assertEqual(read_response(stream)[0], 202)
+
+    def test_get_without_body_keeps_the_connection(self) -> None:
+        sock, stream = self.connect(self.start_server())
+        sock.sendall(b"GET /v1/alerts HTTP/1.1\r\nHost: localhost\r\n\r\n")
+        status, headers, _ = read_response(stream)
+        self.assertEqual(status, 405)
+        self.assertNotIn("connection", headers)
+        sock.sendall(alert_request())
+        self.assertEqual(read_response(stream)[0], 202)
+
+    def test_unread_body_is_not_served_as_a_request(self) -> None:
+        smuggled = alert_request()
+        cases = {
+            "get-content-length": alert_request(smuggled, method="GET"),
+            "get-chunked": alert_request(
+                b"%x\r\n%s\r\n0\r\n\r\n" % (len(smuggled), smuggled),
+                method="GET", headers={"Content-Length": None, "Transfer-Encoding": "chunked"},
+            ),
+            "rejected-post": alert_request(smuggled, headers={"Authorization": "Bearer wrong-token-0000"}),
+        }
+        for name, request in cases.items():
+            with self.subTest(name):
+                sock, stream = self.connect(self.start_server())
+                sock.sendall(request)
+                status, headers, _ = read_response(stream)
+                self.assertIn(status, (401, 405))
+                self.assertEqual(headers.get("connection"), "close")
+                self.assert_closed(stream)
+        self.assertEqual(self.mailmux.deliveries, [])
+
+    def test_post_with_transfer_encoding_is_rejected(self) -> None:
+        for headers in ({"Transfer-Encoding": "chunked", "Content-Length": None},
+                        {"Transfer-Encoding": "chunked"}):
+            with self.subTest(headers=headers):
+                sock, stream = self.connect(self.start_server())
+                body = b"%x\r\n%s\r\n0\r\n\r\n" % (len(_ALERT_BODY), _ALERT_BODY)
+                sock.sendall(alert_request(body, headers=headers))
+                status, response_headers, response_body = read_response(stream)
+                self.assertEqual(status, 400)
+                self.assertEqual(response_headers.get("connection"), "close")
+                self.assertEqual(orjson.loads(response_body)["error"]["code"], "TRANSFER_ENCODING_UNSUPPORTED")
+                self.assert_closed(stream)
+        self.assertEqual(self.mailmux.deliveries, [])
+
+    @unittest.skipUnless(hasattr(signal, "setitimer"), "needs signal.setitimer")
+    def test_shutdown_from_the_serving_thread(self) -> None:
+        # As in __main__, a signal handler runs shutdown() on the thread that
+        # is inside serve_forever; it must return instead of waiting on itself.
+        httpd = self.create_server()
+        self.addCleanup(httpd.server_close)
+        handled = []
+
+        def _shutdown(*_args: object) -> None:
+            httpd.shutdown()
+            handled.append(True)
+
+        previous = signal.signal(signal.SIGALRM, _shutdown)
+        self.addCleanup(signal.signal, signal.SIGALRM, previous)
+        signal.setitimer(signal.ITIMER_REAL, 0.2)
+        started = time.monotonic()
+        httpd.serve_forever(poll_interval=0.05)
+        self.assertEqual(handled, [True])
+        self.assertLess(time.monotonic() - started, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()